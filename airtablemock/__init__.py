@@ -1,39 +1,93 @@
 """A mock for the airtable module to ease unittests."""
 
+import bisect
 import collections
+import functools
 import itertools
 import json
 import logging
 import random
 import re
 import sys
+import types
 import unittest
 from urllib import parse
 import warnings
 
-import mock
-from parsimonious import exceptions
-from parsimonious import grammar
-import requests
-
 
 _API_URL = 'https://api.airtable.com/v0/'
 
+
+class _Table(dict):
+    """The records of a table by ID, that also keeps the list of their IDs to paginate."""
+
+    __slots__ = ('_record_ids',)
+
+    def __init__(self):
+        super(_Table, self).__init__()
+        self._record_ids = None
+
+    def record_ids(self):
+        """Get the list of all record IDs in order. It should not be modified."""
+
+        if self._record_ids is None:
+            self._record_ids = list(self)
+        return self._record_ids
+
+    def add(self, record_id, fields):
+        """Add a new record, unless its ID is already used. Returns whether it was added."""
+
+        if self.setdefault(record_id, fields) is not fields:
+            return False
+        if self._record_ids is not None:
+            self._record_ids.append(record_id)
+        return True
+
+    def remove(self, record_id):
+        """Remove a record."""
+
+        del self[record_id]
+        # Rebuilt lazily, so that removing many records is not quadratic.
+        self._record_ids = None
+
+
 # A dictionary of all Airtable bases accessed by MockAirtable clients.
-_BASES = collections.defaultdict(lambda: collections.defaultdict(collections.OrderedDict))
+_BASES = collections.defaultdict(lambda: collections.defaultdict(_Table))
 
 # A dictionary of all views predicates grouped by base ID and table name.
-_VIEWS = collections.defaultdict(lambda: collections.defaultdict(collections.OrderedDict))
+_VIEWS = collections.defaultdict(lambda: collections.defaultdict(dict))
+
+# A dictionary of _FieldIndex grouped by base ID, table name and field name.
+# Built lazily for simple comparison formulas, once a field was already queried
+# (None until then), and dropped for a table as soon as it is modified.
+_INDEXES = collections.defaultdict(lambda: collections.defaultdict(dict))
+
+# A dictionary of lists of record IDs grouped by base ID, table name, and
+# formula and view filtering them, each with the iterator over the next matching
+# records. Extended lazily page after page, and dropped for a table as soon as it
+# is modified.
+_FILTERED_RECORD_IDS = collections.defaultdict(lambda: collections.defaultdict(dict))
+
+
+# The number of times all tables were dropped, so that clients know when to
+# drop the tables they cached.
+_NUM_CLEARS = 0
 
 
 def clear():
     """Drop all tables from all bases."""
+    global _NUM_CLEARS
+    _NUM_CLEARS += 1
     _BASES.clear()
     _VIEWS.clear()
+    _INDEXES.clear()
+    _FILTERED_RECORD_IDS.clear()
 
 
 def patch(target):
     """A function or class decorator to patch the target airtable module with this one."""
+    import mock
+
     clear()
     return mock.patch(target, new=sys.modules[__name__])
 
@@ -41,13 +95,24 @@ def patch(target):
 class Airtable(object):
     """Airtable mock client."""
 
-    def __init__(self, base_id=None, api_key=None, dict_class=collections.OrderedDict):
+    def __init__(self, base_id=None, api_key=None, dict_class=dict, read_only=False):
         self.base_id = base_id
         self.api_key = api_key
         self._dict_class = dict_class
+        # Return read-only views on the fields of records instead of copies.
+        self._read_only = read_only
+        self._tables = {}
+        self._tables_num_clears = _NUM_CLEARS
 
     def _table(self, table_name, must_exist=True):
-        if must_exist and table_name not in _BASES[self.base_id]:
+        if self._tables_num_clears != _NUM_CLEARS:
+            self._tables = {}
+            self._tables_num_clears = _NUM_CLEARS
+        table = self._tables.get(table_name)
+        if table is not None:
+            return table
+
+        if must_exist and table_name not in _BASES.get(self.base_id, {}):
             logging.warning(
                 'Testers, before accessing a table it should be created, probably in your '
                 'test code. Either:\n'
@@ -56,24 +121,77 @@ class Airtable(object):
                 ' - create an empty table using\n'
                 '   airtablemock.create_empty_table({base}, {table})'.format(
                     base=repr(self.base_id), table=repr(table_name)))
-            response = requests.Response()
-            response.status_code = 404
-            response.reason = 'Not Found'
-            response.url = '{}{}/{}'.format(
-                _API_URL, parse.quote(self.base_id or ''), parse.quote(table_name or ''))
-            response.raise_for_status()
-        return _BASES[self.base_id][table_name]
+            _raise_http_error(404, 'Not Found', '{}{}/{}'.format(
+                _API_URL, parse.quote(self.base_id or ''), parse.quote(table_name or '')))
+        table = self._tables[table_name] = _BASES[self.base_id][table_name]
+        return table
+
+    def _index(self, table_name, table, field):
+        indexes = _INDEXES[self.base_id][table_name]
+        if field not in indexes:
+            # Building an index costs a full scan, so only do it when the field
+            # is queried a second time without any write in between.
+            indexes[field] = None
+            return None
+        index = indexes[field]
+        if index is None:
+            index = indexes[field] = _FieldIndex(table, field)
+        return index
+
+    def _filtered_record_ids(self, table_name, table, filter_by_formula, view, num_records):
+        """Get the IDs of the first num_records matching records, or more if already known."""
+        if not (filter_by_formula or view):
+            return table.record_ids()
+        if view and not _VIEWS:
+            # The view is ignored for now, but will not be as soon as views get created.
+            return [
+                record_id
+                for record_id, unused_fields in self._iterate_fields(
+                    table_name, table, filter_by_formula, view, num_records, ())
+            ]
+        filtered_record_ids = _FILTERED_RECORD_IDS[self.base_id][table_name]
+        key = (filter_by_formula, view)
+        cached = filtered_record_ids.get(key)
+        if cached is None:
+            cached = filtered_record_ids[key] = (
+                [], self._iterate_fields(table_name, table, filter_by_formula, view, 0, ()))
+        record_ids, pairs = cached
+        if len(record_ids) < num_records:
+            try:
+                record_ids.extend(
+                    record_id
+                    for record_id, unused_fields in itertools.islice(
+                        pairs, num_records - len(record_ids)))
+            except Exception:
+                del filtered_record_ids[key]
+                raise
+        return record_ids
+
+    def _drop_caches(self, table_name):
+        _INDEXES[self.base_id].pop(table_name, None)
+        _FILTERED_RECORD_IDS[self.base_id].pop(table_name, None)
 
     def _create_record(self, id, fields):
+        if self._dict_class is dict:
+            return {'id': id, 'fields': fields}
         return self._dict_class([('id', id), ('fields', fields)])
 
     def _filter_dict(self, values, fields):
+        # Never return the stored values themselves, so that the table cannot be
+        # modified by mistake.
         if fields:
-            return self._dict_class([
-                (key, value)
-                for key, value in values.items()
-                if key in fields
-            ])
+            if self._dict_class is dict:
+                values = {key: value for key, value in values.items() if key in fields}
+            else:
+                values = self._dict_class([
+                    (key, value)
+                    for key, value in values.items()
+                    if key in fields
+                ])
+        elif not self._read_only:
+            return self._dict_class(values)
+        if self._read_only:
+            return types.MappingProxyType(values)
         return values
 
     def iterate(
@@ -83,32 +201,80 @@ class Airtable(object):
         if batch_size:
             logging.info('batch_size ignored in MockAirtableClient.iterate')
 
-        items = self._table(table_name).items()
+        yield from self._iterate(
+            table_name, self._table(table_name), filter_by_formula, view, max_records, fields)
+
+    def iterate_fields(
+            self, table_name, filter_by_formula=None, view=None, max_records=0, fields=()):
+        """Iterate over the (ID, fields) pairs of all records of a table.
 
+        This is not part of the official API, so you should only use this in tests.
+        It is a faster iterate, as it does not create a record for each pair.
+        """
+        yield from self._iterate_fields(
+            table_name, self._table(table_name), filter_by_formula, view, max_records, fields)
+
+    def _iterate(self, table_name, table, filter_by_formula, view, max_records, fields):
+        pairs = self._iterate_fields(
+            table_name, table, filter_by_formula, view, max_records, fields)
+        if self._dict_class is dict:
+            return ({'id': record_id, 'fields': fields} for record_id, fields in pairs)
+        return itertools.starmap(self._create_record, pairs)
+
+    def _iterate_fields(self, table_name, table, filter_by_formula, view, max_records, fields):
+        view_predicate = None
         if view:
             if _VIEWS:
-                view_predicate = _VIEWS[self.base_id][table_name].get(view)
+                view_predicate = _VIEWS.get(self.base_id, {}).get(table_name, {}).get(view)
                 if not view_predicate:
-                    response = requests.Response()
-                    response.status_code = 422
-                    response.reason = 'Unprocessable Entity'
-                    response.url = '{}{}/{}?view={}'.format(
+                    _raise_http_error(422, 'Unprocessable Entity', '{}{}/{}?view={}'.format(
                         _API_URL, parse.quote(self.base_id or ''), parse.quote(table_name or ''),
-                        parse.quote(view))
-                    response.raise_for_status()
-                items = filter(view_predicate, items)
+                        parse.quote(view)))
             else:
                 logging.warning(
                     'The view field is ignored as no views were created in airtablemock.')
 
+        predicate = None
+        items = table.items()
         if filter_by_formula:
-            items = filter(_create_predicate(filter_by_formula), items)
-
-        if max_records:
-            items = itertools.islice(items, 0, max_records)
+            comparison = _get_comparison(filter_by_formula)
+            record_ids = None
+            if comparison:
+                fieldname, operator, value = comparison
+                index = self._index(table_name, table, fieldname)
+                if index is not None:
+                    record_ids = index.get_record_ids(operator, value)
+            if record_ids is None:
+                predicate = _create_predicate(filter_by_formula)
+            else:
+                items = ((record_id, table[record_id]) for record_id in record_ids)
 
-        for record_id, values in items:
-            yield self._create_record(record_id, self._filter_dict(values, fields))
+        if fields:
+            fields = frozenset(fields)
+
+        # Filter, limit and project the records in a single loop.
+        is_plain_dict = self._dict_class is dict
+        read_only = self._read_only
+        num_records = 0
+        for item in items:
+            if view_predicate and not view_predicate(item):
+                continue
+            if predicate and not predicate(item):
+                continue
+            record_id, values = item
+            if is_plain_dict:
+                if fields:
+                    values = {key: value for key, value in values.items() if key in fields}
+                elif not read_only:
+                    values = values.copy()
+                if read_only:
+                    values = types.MappingProxyType(values)
+                yield record_id, values
+            else:
+                yield record_id, self._filter_dict(values, fields)
+            num_records += 1
+            if num_records == max_records:
+                return
 
     def get(self, table_name, record_id=None, limit=0, offset=None,
             filter_by_formula=None, view=None, max_records=0, fields=()):
@@ -120,28 +286,44 @@ class Airtable(object):
         will return an error (the same error that Airtable would respond in
         case of a incorrect view).
         """
+        table = self._table(table_name)
         if record_id:
-            return self._create_record(
-                record_id, self._filter_dict(self._table(table_name)[record_id], fields))
-
-        items = self.iterate(
-            table_name, filter_by_formula=filter_by_formula, view=view, max_records=max_records,
-            fields=fields)
-
-        if offset:
-            items = itertools.islice(items, offset, None)
+            return self._create_record(record_id, self._filter_dict(table[record_id], fields))
 
         if not limit or limit > 100:
             # Default value, on Airtable server.
             limit = 100
-        items_limited = itertools.islice(items, limit)
 
-        all_items = list(items_limited)
+        if offset or not (filter_by_formula or view):
+            # Slice the list of matching records, instead of filtering all the
+            # records of the previous pages again.
+            start = offset or 0
+            # Get one more record than the page, to know whether there is a next one.
+            num_records = start + limit + 1
+            if max_records:
+                num_records = min(num_records, max_records)
+            record_ids = self._filtered_record_ids(
+                table_name, table, filter_by_formula, view, num_records)
+            num_records = min(num_records, len(record_ids))
+            stop = min(start + limit, num_records)
+            page = record_ids[start:stop]
+            fields = frozenset(fields)
+            all_items = [
+                self._create_record(record_id, self._filter_dict(table[record_id], fields))
+                for record_id in page
+            ]
+            response = {'records': all_items}
+            if stop < num_records:
+                response['offset'] = stop
+            return response
+
+        items = self._iterate(table_name, table, filter_by_formula, view, max_records, fields)
+        all_items = list(itertools.islice(items, limit))
         response = {'records': all_items}
         try:
             next(items)
             # TODO(pascal): Use a record ID offset, not a number...
-            response['offset'] = (offset or 0) + len(all_items)
+            response['offset'] = len(all_items)
         except StopIteration:
             ...
         return response
@@ -149,32 +331,54 @@ class Airtable(object):
     def create(self, table_name, data):
         """Create a new record."""
         table = self._table(table_name, must_exist=False)
+        fields = self._dict_class(data)
         for unused_i in range(30):
-            record_id = _generate_random_id()
-            if record_id not in table:
+            record_id = 'rec%016x' % random.getrandbits(64)
+            if table.add(record_id, fields):
                 break
         else:
             raise RuntimeError('Could not generate a new random ID')
 
-        table[record_id] = data
-        return self._create_record(record_id, self._dict_class(data))
+        self._drop_caches(table_name)
+        return self._create_record(record_id, self._filter_dict(fields, ()))
 
     def update(self, table_name, record_id, data):
         """Update one record partially."""
+        record = self._table(table_name)[record_id]
+        record.update(data)
+        self._drop_caches(table_name)
+        return self._create_record(record_id, self._filter_dict(record, ()))
+
+    def batch_update(self, table_name, updates):
+        """Update many records partially from an iterable of (record ID, data) pairs.
+
+        This is not part of the official API, so you should only use this in tests.
+        """
         table = self._table(table_name)
-        table[record_id].update(data)
-        return self._create_record(record_id, table[record_id])
+        records = []
+        try:
+            for record_id, data in updates:
+                record = table[record_id]
+                record.update(data)
+                records.append(self._create_record(record_id, self._filter_dict(record, ())))
+        finally:
+            self._drop_caches(table_name)
+        return records
 
     def update_all(self, table_name, record_id, data):
         """Update one record completely."""
         table = self._table(table_name)
-        table[record_id] = self._dict_class(data)
-        return self._create_record(record_id, table[record_id])
+        fields = self._dict_class(data)
+        if not table.add(record_id, fields):
+            table[record_id] = fields
+        self._drop_caches(table_name)
+        return self._create_record(record_id, self._filter_dict(fields, ()))
 
     def delete(self, table_name, record_id):
         """Delete a record."""
         table = self._table(table_name)
-        del table[record_id]
+        table.remove(record_id)
+        self._drop_caches(table_name)
         return self._dict_class([('id', record_id), ('deleted', True)])
 
     def create_view(self, table_name, view_name, formula):
@@ -188,82 +392,182 @@ class Airtable(object):
 
 # See grammar at
 # https://support.airtable.com/hc/en-us/articles/203255215-Formula-field-reference
-_FORMULA_GRAMMAR = grammar.Grammar(
-    r'''
-    expression  = simple_expression / function_call
-    simple_expression = field_or_value blank operator blank field_or_value
-    function_call = binary_function "(" expression "," blank expression ")"
-    field_or_value = field / numeric / text
-    blank       = ~"\s*"
-    field       = ~"[a-z_]\w*"i
-    operator    = "=" / "!=" / "<=" / ">=" / "<" / ">"
-    numeric     = "-"? positive_number ("." positive_number)?
-    positive_number = ~"[0-9]+"
-    text        = "\"" quoted_text "\""
-    quoted_text = ~"([^\"\\\\]|\\\\.)*"
-    binary_function = "AND" / "OR"
-    '''
-)
-
-
+#   expression = simple_expression / function_call
+#   simple_expression = field_or_value operator field_or_value
+#   function_call = ("AND" / "OR") "(" expression "," expression ")"
+#   field_or_value = field / numeric / text
+_TOKEN_REGEX = re.compile(
+    r'(?P<blank>\s+)|(?P<field>[a-z_]\w*)|(?P<text>"(?:[^"\\]|\\.)*")|'
+    r'(?P<numeric>-?\d+(?:\.\d+)?)|(?P<operator><=|>=|!=|[=<>])|(?P<punctuation>[(),])|'
+    r'(?P<unknown>.)',
+    re.IGNORECASE)
+
+# Python operators for the formula ones.
+_PYTHON_OPERATORS = {
+    '=': '==',
+    '!=': '!=',
+    '<': '<',
+    '<=': '<=',
+    '>': '>',
+    '>=': '>=',
+}
+
+# Python boolean operators for the formula binary functions.
+_PYTHON_FUNCTIONS = {
+    'AND': 'and',
+    'OR': 'or',
+}
+
+
+def _tokenize(formula):
+    tokens = []
+    for match in _TOKEN_REGEX.finditer(formula):
+        kind = match.lastgroup
+        if kind == 'unknown':
+            raise ValueError('Unexpected character {!r}'.format(match.group()))
+        if kind != 'blank':
+            tokens.append((kind, match.group()))
+    return tokens
+
+
+@functools.lru_cache(maxsize=1024)
 def _create_predicate(formula):
     try:
-        formula_parsed = _FORMULA_GRAMMAR.parse(formula)
-    except exceptions.ParseError:
+        tokens = _tokenize(formula)
+        source, position = _parse_expression(tokens, 0)
+        if position != len(tokens):
+            raise ValueError('Unexpected token {!r}'.format(tokens[position][1]))
+    except ValueError:
         raise NotImplementedError(
             'The filter_by_formula feature is not implemented in airtablemock for this formula {}.'
             .format(formula))
-    return _create_predicate_from_node(formula_parsed)
+    # Compile the whole formula as a single lambda to avoid a tree of closures.
+    return eval(
+        compile('lambda key_fields: ' + source, '<formula>', 'eval'), {'__builtins__': {}})
 
 
-def _create_predicate_from_node(formula):
-    if formula.expr_name == 'expression' and len(formula.children) == 1:
-        formula = formula.children[0]
+# Operators to use when swapping the operands of a comparison.
+_SWAPPED_OPERATORS = {
+    '=': '=',
+    '!=': '!=',
+    '<': '>',
+    '<=': '>=',
+    '>': '<',
+    '>=': '<=',
+}
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_comparison(formula):
+    """Get the field name, operator and value of a simple comparison formula, None otherwise."""
+
+    try:
+        tokens = _tokenize(formula)
+    except ValueError:
+        return None
+    if len(tokens) != 3 or tokens[1][0] != 'operator':
+        return None
+    field_token, (unused_kind, operator), value_token = tokens
+    if value_token[0] == 'field':
+        field_token, value_token = value_token, field_token
+        operator = _SWAPPED_OPERATORS[operator]
+    if field_token[0] != 'field' or value_token[0] not in ('numeric', 'text'):
+        return None
+    try:
+        return field_token[1], operator, json.loads(value_token[1])
+    except ValueError:
+        return None
+
+
+def _is_number(value):
+    # NaN cannot be sorted.
+    return isinstance(value, (int, float)) and value == value
+
+
+class _FieldIndex(object):
+    """Positions of the records of a table grouped by the value of one field."""
+
+    def __init__(self, table, field):
+        self._record_ids = table.record_ids()
+        self._positions = {}
+        # Whether all the records have a number for this field, so that they can be sorted.
+        self._is_numeric = True
+        self._sorted_values = None
+        for position, values in enumerate(table.values()):
+            value = values.get(field)
+            if self._is_numeric and not _is_number(value):
+                self._is_numeric = False
+            try:
+                self._positions.setdefault(value, []).append(position)
+            except TypeError:
+                # Unhashable values can never be equal to a formula value.
+                ...
+
+    def get_record_ids(self, operator, value):
+        """Get the IDs of the records matching a comparison, or None if not supported."""
 
-    if formula.expr_name == 'simple_expression' and len(formula.children) == 5:
-        operator = formula.children[2].text
-        get_a = _create_value_getter_from_node(formula.children[0])
-        get_b = _create_value_getter_from_node(formula.children[-1])
         if operator == '=':
-            return lambda *args: get_a(*args) == get_b(*args)
-        if operator == '!=':
-            return lambda *args: get_a(*args) != get_b(*args)
-        if operator == '<':
-            return lambda *args: get_a(*args) < get_b(*args)
-        if operator == '<=':
-            return lambda *args: get_a(*args) <= get_b(*args)
-        if operator == '>':
-            return lambda *args: get_a(*args) > get_b(*args)
-        if operator == '>=':
-            return lambda *args: get_a(*args) >= get_b(*args)
-        raise NotImplementedError(
-            'Operator {} not supported yet in filter_by_formula'.format(operator))
-
-    if formula.expr_name == 'function_call':
-        funcname = formula.children[0].text
-        pred1 = _create_predicate_from_node(formula.children[2])
-        pred2 = _create_predicate_from_node(formula.children[5])
-        if funcname == 'AND':
-            return lambda *args: pred1(*args) and pred2(*args)
-        if funcname == 'OR':
-            return lambda *args: pred1(*args) or pred2(*args)
-        raise NotImplementedError(
-            'Function "{}" not supported yet in filter_by_formula'.format(funcname))
+            positions = self._positions.get(value, ())
+        elif operator == '!=' or not self._is_numeric or not _is_number(value):
+            return None
+        else:
+            if self._sorted_values is None:
+                self._sorted_values = sorted(self._positions)
+            sorted_values = self._sorted_values
+            start = 0
+            end = len(sorted_values)
+            if operator == '<':
+                end = bisect.bisect_left(sorted_values, value)
+            elif operator == '<=':
+                end = bisect.bisect_right(sorted_values, value)
+            elif operator == '>':
+                start = bisect.bisect_right(sorted_values, value)
+            else:
+                start = bisect.bisect_left(sorted_values, value)
+            positions = sorted(itertools.chain.from_iterable(
+                self._positions[sorted_value] for sorted_value in sorted_values[start:end]))
+        return [self._record_ids[position] for position in positions]
 
-    raise NotImplementedError(
-        'Grammar not supported yet in filter_by_formula: {}'.format(formula.text))
 
+def _get_token(tokens, position, kind=None, text=None):
+    if position >= len(tokens):
+        raise ValueError('Unexpected end of formula')
+    token = tokens[position]
+    if (kind and token[0] != kind) or (text and token[1] != text):
+        raise ValueError('Unexpected token {!r}'.format(token[1]))
+    return token
 
-def _create_value_getter_from_node(node):
-    if node.expr_name == 'field_or_value' and len(node.children) == 1:
-        node = node.children[0]
 
-    if node.expr_name == 'field':
-        fieldname = node.text
-        return lambda key_fields: key_fields[1].get(fieldname)
+def _parse_expression(tokens, position):
+    """Parse an expression: returns the source code of its predicate and the next position."""
 
-    value = json.loads(node.text)
-    return lambda *args: value
+    funcname = _get_token(tokens, position)[1]
+    if position + 1 < len(tokens) and tokens[position + 1] == ('punctuation', '('):
+        python_function = _PYTHON_FUNCTIONS.get(funcname)
+        if not python_function:
+            raise NotImplementedError(
+                'Function "{}" not supported yet in filter_by_formula'.format(funcname))
+        pred1, position = _parse_expression(tokens, position + 2)
+        _get_token(tokens, position, text=',')
+        pred2, position = _parse_expression(tokens, position + 1)
+        _get_token(tokens, position, text=')')
+        return '({}) {} ({})'.format(pred1, python_function, pred2), position + 1
+
+    get_a = _parse_value(tokens, position)
+    operator = _get_token(tokens, position + 1, kind='operator')[1]
+    get_b = _parse_value(tokens, position + 2)
+    return '{} {} {}'.format(get_a, _PYTHON_OPERATORS[operator], get_b), position + 3
+
+
+def _parse_value(tokens, position):
+    """Parse a field or a value: returns the source code of its getter."""
+
+    kind, text = _get_token(tokens, position)
+    if kind == 'field':
+        return 'key_fields[1].get({!r})'.format(text)
+    if kind in ('numeric', 'text'):
+        return repr(json.loads(text))
+    raise ValueError('Unexpected token {!r}'.format(text))
 
 
 class TestCase(unittest.TestCase):
@@ -274,6 +578,8 @@ class TestCase(unittest.TestCase):
     """
 
     def setUp(self):
+        import mock
+
         super(TestCase, self).setUp()
         patcher = mock.patch('airtable.airtable.Airtable', Airtable)
         patcher.start()
@@ -281,8 +587,15 @@ class TestCase(unittest.TestCase):
         self.addCleanup(clear)
 
 
-def _generate_random_id():
-    return 'rec%x' % random.randrange(0x10000000000)
+def _raise_http_error(status_code, reason, url):
+    # Imported lazily, as requests is slow to import and only needed on errors.
+    import requests
+
+    response = requests.Response()
+    response.status_code = status_code
+    response.reason = reason
+    response.url = url
+    response.raise_for_status()
 
 
 def create_empty_table(base_id, table_name):
@@ -296,9 +609,9 @@ def create_empty_table(base_id, table_name):
 def create_view(base_id, table_name, view_name, formula):
     """Creates a view on a given table."""
 
-    if table_name not in _BASES[base_id]:
+    if table_name not in _BASES.get(base_id, {}):
         raise ValueError('Table "{}" does not exist in "{}" yet'.format(table_name, base_id))
-    if view_name in _VIEWS[base_id][table_name]:
+    if view_name in _VIEWS.get(base_id, {}).get(table_name, {}):
         raise ValueError(
             'View "{}" already exists in "{}:{}"'.format(view_name, base_id, table_name))
     # TODO(pascal): Implement the different sorting.
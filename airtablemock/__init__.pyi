@@ -11,7 +11,7 @@ def patch(target: typing.Any) -> mock._patch[mock.MagicMock]:
   ...
 
 
-_Record = typing.Dict[str, typing.Union[str, typing.Dict[str, typing.Any]]]
+_Record = typing.Dict[str, typing.Union[str, typing.Mapping[str, typing.Any]]]
 
 
 class Airtable(object):
@@ -19,7 +19,9 @@ class Airtable(object):
   def __init__(
       self,
       base_id: typing.Optional[str] = None,
-      api_key: typing.Optional[str] = None) -> None:
+      api_key: typing.Optional[str] = None,
+      dict_class: type = ...,
+      read_only: bool = False) -> None:
     ...
 
   def iterate(
@@ -30,6 +32,16 @@ class Airtable(object):
       view: typing.Optional[str] = None) -> typing.Iterator[_Record]:
     ...
 
+  def iterate_fields(
+      self,
+      table_name: str,
+      filter_by_formula: typing.Optional[str] = None,
+      view: typing.Optional[str] = None,
+      max_records: int = 0,
+      fields: typing.Iterable[str] = ()) \
+      -> typing.Iterator[typing.Tuple[str, typing.Mapping[str, typing.Any]]]:
+    ...
+
   @typing.overload
   def get(
       self,
@@ -60,6 +72,13 @@ class Airtable(object):
   def update(self, table_name: str, record_id: str, data: typing.Dict[str, typing.Any]) -> _Record:
     ...
 
+  def batch_update(
+      self,
+      table_name: str,
+      updates: typing.Iterable[typing.Tuple[str, typing.Dict[str, typing.Any]]]) \
+      -> typing.List[_Record]:
+    ...
+
   def update_all(self, table_name: str, record_id: str, data: typing.Dict[str, typing.Any]) -> _Record:
     ...
 
@@ -31,8 +31,8 @@ class AirtablemockTestCase(airtablemock.TestCase):
 
         base = airtable.Airtable('base', '')
         record = base.create('table', {'number': 1})
-        self.assertEqual(collections.OrderedDict, type(record))
-        self.assertEqual(collections.OrderedDict, type(record['fields']))
+        self.assertEqual(dict, type(record))
+        self.assertEqual(dict, type(record['fields']))
         base.create('table', {'number': 2})
 
         fetched_record = base.get('table', record_id=record['id'])
@@ -40,11 +40,33 @@ class AirtablemockTestCase(airtablemock.TestCase):
         self.assertEqual(record, fetched_record)
 
     def test_dict_class(self) -> None:
-        """Test getting one record by its ID."""
+        """Test using a specific dict class for records."""
 
-        base = airtable.Airtable('base', '', dict_class=dict)
+        base = airtable.Airtable('base', '', dict_class=collections.OrderedDict)
         record = base.create('table', {'number': 1})
-        self.assertEqual(dict, type(record))
+        self.assertEqual(collections.OrderedDict, type(record))
+        self.assertEqual(collections.OrderedDict, type(record['fields']))
+
+    def test_patch_client_method(self) -> None:
+        """Methods of a client can be patched."""
+
+        base = airtable.Airtable('base', '')
+        with mock.patch.object(base, 'get') as mock_get:
+            mock_get.return_value = {'records': []}
+            self.assertEqual({'records': []}, base.get('table'))
+        mock_get.assert_called_once_with('table')
+
+    def test_dict_class_create_returns_copy(self) -> None:
+        """Modifying a created record does not modify the table."""
+
+        base = airtable.Airtable('base', '', dict_class=collections.OrderedDict)
+        base.create('table', {'number': 1})
+        self.assertEqual(1, len(base.get('table', filter_by_formula='number = 1')['records']))
+        record = base.create('table', {'number': 1})
+        record['fields']['number'] = 2
+
+        records = base.get('table', filter_by_formula='number = 1')['records']
+        self.assertEqual([{'number': 1}] * 2, [record['fields'] for record in records])
 
     @mock.patch('logging.warning')
     def test_get_missing_table(self, mock_warning: mock.MagicMock) -> None:
@@ -109,6 +131,44 @@ class AirtablemockTestCase(airtablemock.TestCase):
 
         self.assertEqual([1, 3], [record['fields']['number'] for record in records])
 
+    def test_filter_by_formula_equal_after_updates(self) -> None:
+        """Test filtering by formula with a simple equal while the table changes."""
+
+        base = airtable.Airtable('base', '')
+        record_id = base.create('table', {'number': 1, 'filter': 'yes'})['id']
+        base.create('table', {'number': 2, 'filter': 'no'})
+
+        records = base.get('table', filter_by_formula='"yes" = filter')['records']
+        self.assertEqual([1], [record['fields']['number'] for record in records])
+
+        base.create('table', {'number': 3, 'filter': 'yes'})
+        base.update('table', record_id, {'filter': 'no'})
+
+        records = base.get('table', filter_by_formula='filter = "yes"')['records']
+        self.assertEqual([3], [record['fields']['number'] for record in records])
+
+        records = base.get('table', filter_by_formula='filter = "no"')['records']
+        self.assertEqual([1, 2], [record['fields']['number'] for record in records])
+
+        base.delete('table', record_id)
+
+        records = base.get('table', filter_by_formula='filter = "no"')['records']
+        self.assertEqual([2], [record['fields']['number'] for record in records])
+
+    def test_filter_by_formula_equal_between_creates(self) -> None:
+        """Test looking up a record by formula after each insert."""
+
+        base = airtable.Airtable('base', '')
+        for number in range(10):
+            base.create('table', {'number': number % 3})
+            record = next(base.iterate('table', filter_by_formula='number = {}'.format(number % 3)))
+            self.assertEqual({'number': number % 3}, record['fields'])
+
+        # Query the same field again without any write in between.
+        for number in range(3):
+            records = base.get('table', filter_by_formula='number = {}'.format(number))['records']
+            self.assertEqual(4 if number == 0 else 3, len(records))
+
     def test_filter_by_formula_greater(self) -> None:
         """Test filtering by formula with a numerical greater than."""
 
@@ -121,6 +181,50 @@ class AirtablemockTestCase(airtablemock.TestCase):
 
         self.assertEqual([2, 3], [record['fields']['number'] for record in records])
 
+    def test_filter_by_formula_lower(self) -> None:
+        """Test filtering by formula with a numerical lower than, value first."""
+
+        base = airtable.Airtable('base', '')
+        base.create('table', {'number': 3, 'filter': 'yes'})
+        record_id = base.create('table', {'number': 1, 'filter': 'no'})['id']
+        base.create('table', {'number': 2, 'filter': 'yes'})
+
+        records = base.get('table', filter_by_formula='2.5 > number')['records']
+        self.assertEqual([1, 2], [record['fields']['number'] for record in records])
+
+        base.update('table', record_id, {'number': 4})
+
+        records = base.get('table', filter_by_formula='2.5 > number')['records']
+        self.assertEqual([2], [record['fields']['number'] for record in records])
+
+    def test_filter_by_formula_greater_between_creates(self) -> None:
+        """Test filtering by a numerical comparison after each insert."""
+
+        base = airtable.Airtable('base', '')
+        for number in range(6):
+            base.create('table', {'number': number})
+            records = base.get('table', filter_by_formula='number > 2')['records']
+            self.assertEqual(
+                list(range(3, number + 1)), [record['fields']['number'] for record in records])
+
+        # Query the same field again without any write in between.
+        records = base.get('table', filter_by_formula='number < 2')['records']
+        self.assertEqual([0, 1], [record['fields']['number'] for record in records])
+        records = base.get('table', filter_by_formula='number >= 4')['records']
+        self.assertEqual([4, 5], [record['fields']['number'] for record in records])
+
+    def test_filter_by_formula_text_greater(self) -> None:
+        """Test filtering by formula with a text greater than."""
+
+        base = airtable.Airtable('base', '')
+        base.create('table', {'number': 1, 'filter': 'yes'})
+        base.create('table', {'number': 2, 'filter': 'no'})
+        base.create('table', {'number': 3, 'filter': 'yes'})
+
+        records = base.get('table', filter_by_formula='filter > "no"')['records']
+
+        self.assertEqual([1, 3], [record['fields']['number'] for record in records])
+
     def test_filter_by_formula_and(self) -> None:
         """Test filtering by formula using AND."""
 
@@ -134,6 +238,31 @@ class AirtablemockTestCase(airtablemock.TestCase):
 
         self.assertEqual([3], [record['fields']['number'] for record in records])
 
+    def test_filter_by_formula_or(self) -> None:
+        """Test filtering by formula using OR."""
+
+        base = airtable.Airtable('base', '')
+        base.create('table', {'number': 1, 'filter': 'yes', 'other': 'a'})
+        base.create('table', {'number': 2, 'filter': 'no', 'other': 'a'})
+        base.create('table', {'number': 3, 'filter': 'no', 'other': 'b'})
+
+        records = base.get(
+            'table', filter_by_formula='OR(filter = "yes", other = "b")')['records']
+
+        self.assertEqual([1, 3], [record['fields']['number'] for record in records])
+
+    def test_filter_by_formula_not_implemented(self) -> None:
+        """Test filtering by a formula that is not supported."""
+
+        base = airtable.Airtable('base', '')
+        base.create('table', {'number': 1, 'filter': 'yes'})
+
+        with self.assertRaises(NotImplementedError):
+            base.get('table', filter_by_formula='NOT(filter = "yes")')
+
+        with self.assertRaises(NotImplementedError):
+            base.get('table', filter_by_formula='filter = "yes" number')
+
     def test_filter_by_formula_offset(self) -> None:
         """Test filtering by formula and using an offset."""
 
@@ -147,6 +276,59 @@ class AirtablemockTestCase(airtablemock.TestCase):
 
         self.assertEqual([3], [record['fields']['number'] for record in records])
 
+    def test_filter_by_formula_pages(self) -> None:
+        """Test paginating records filtered by formula while the table changes."""
+
+        base = airtable.Airtable('base', '')
+        for number in range(10):
+            base.create('table', {'number': number, 'filter': 'yes' if number % 3 else 'no'})
+
+        response = base.get('table', filter_by_formula='filter = "yes"', limit=2, offset=2)
+        self.assertEqual([4, 5], [record['fields']['number'] for record in response['records']])
+        self.assertEqual(4, response.get('offset'))
+
+        base.create('table', {'number': 10, 'filter': 'yes'})
+
+        response = base.get(
+            'table', filter_by_formula='filter = "yes"', limit=2,
+            offset=typing.cast(int, response.get('offset')))
+        self.assertEqual([7, 8], [record['fields']['number'] for record in response['records']])
+        self.assertEqual(6, response.get('offset'))
+
+        response = base.get(
+            'table', filter_by_formula='filter = "yes"', limit=2,
+            offset=typing.cast(int, response.get('offset')), fields=('filter',))
+        self.assertEqual([{'filter': 'yes'}], [record['fields'] for record in response['records']])
+        self.assertNotIn('offset', response)
+
+    def test_filter_by_formula_pages_between_creates(self) -> None:
+        """Test getting a page of records filtered by formula after each insert."""
+
+        base = airtable.Airtable('base', '')
+        for number in range(8):
+            base.create('table', {'number': number, 'filter': 'yes' if number % 2 else 'no'})
+            response = base.get('table', filter_by_formula='filter = "yes"', limit=2, offset=1)
+            self.assertEqual(
+                [3, 5][:max(0, (number - 1) // 2)],
+                [record['fields']['number'] for record in response['records']])
+            if number == 7:
+                self.assertEqual(3, response.get('offset'))
+            else:
+                self.assertNotIn('offset', response)
+
+        # Get the next pages without any write in between.
+        response = base.get(
+            'table', filter_by_formula='filter = "yes"', limit=2, offset=3, max_records=3)
+        self.assertEqual([], response['records'])
+        self.assertNotIn('offset', response)
+        response = base.get(
+            'table', filter_by_formula='filter = "yes"', limit=1, offset=2, max_records=4)
+        self.assertEqual([5], [record['fields']['number'] for record in response['records']])
+        self.assertEqual(3, response.get('offset'))
+        response = base.get('table', filter_by_formula='filter = "yes"', limit=2, offset=3)
+        self.assertEqual([7], [record['fields']['number'] for record in response['records']])
+        self.assertNotIn('offset', response)
+
     def test_filter_by_formula_quotes(self) -> None:
         """Test filtering by formula using a string with quotes."""
 
@@ -184,6 +366,38 @@ class AirtablemockTestCase(airtablemock.TestCase):
         self.assertEqual([5], [record['fields']['number'] for record in response['records']])
         self.assertNotIn('offset', response)
 
+    def test_get_limit_while_changing(self) -> None:
+        """Test the limit feature of the get method while the table changes."""
+
+        base = airtable.Airtable('base', '')
+        record_ids = [base.create('table', {'number': number})['id'] for number in range(5)]
+
+        response = base.get('table', limit=2)
+        self.assertEqual([0, 1], [record['fields']['number'] for record in response['records']])
+        self.assertEqual(2, response.get('offset'))
+
+        base.delete('table', record_ids[0])
+        base.create('table', {'number': 5})
+
+        response = base.get('table', limit=2, offset=2)
+        self.assertEqual([3, 4], [record['fields']['number'] for record in response['records']])
+        self.assertEqual(4, response.get('offset'))
+
+        base.create('table', {'number': 6})
+
+        response = base.get('table', limit=2, offset=4)
+        self.assertEqual([5, 6], [record['fields']['number'] for record in response['records']])
+        self.assertNotIn('offset', response)
+
+    def test_get_records_are_dicts(self) -> None:
+        """Test that listed records are plain dicts, as returned by the real client."""
+
+        base = airtable.Airtable('base', '')
+        base.create('table', {'number': 1})
+
+        self.assertEqual(dict, type(base.get('table')['records'][0]))
+        self.assertEqual(dict, type(next(base.iterate('table'))))
+
     def test_get_fields(self) -> None:
         """Test getting only some fields."""
 
@@ -251,6 +465,24 @@ class AirtablemockTestCase(airtablemock.TestCase):
         mock_logging.assert_called_once_with(
             'The view field is ignored as no views were created in airtablemock.')
 
+    @mock.patch('logging.warning')
+    def test_view_created_after_paginating(self, unused_mock_logging: mock.MagicMock) -> None:
+        """Test paginating a view before and after it is created."""
+
+        base = airtable.Airtable('base', '')
+        base.create('table', {'number': 0})
+        base.create('table', {'number': 1})
+        base.create('table', {'number': 2})
+        base.create('table', {'number': 3})
+
+        records = base.get('table', view='filtered view', offset=1)['records']
+        self.assertEqual([1, 2, 3], [record['fields']['number'] for record in records])
+
+        airtablemock.create_view('base', 'table', 'filtered view', 'number > 1')
+
+        records = base.get('table', view='filtered view', offset=1)['records']
+        self.assertEqual([3], [record['fields']['number'] for record in records])
+
     def test_view_and_filter(self) -> None:
         """Test filtering records of a view."""
 
@@ -278,6 +510,11 @@ class AirtablemockTestCase(airtablemock.TestCase):
         with self.assertRaisesRegex(exceptions.HTTPError, match_exception):
             base.get('table', view='non existing view')
 
+        # Also when paginating, even after a first failure.
+        for unused_i in range(2):
+            with self.assertRaisesRegex(exceptions.HTTPError, match_exception):
+                base.get('table', view='non existing view', offset=1)
+
     def test_iterate(self) -> None:
         """Test basic usage of the iterate method."""
 
@@ -312,17 +549,71 @@ class AirtablemockTestCase(airtablemock.TestCase):
 
         self.assertEqual([3], [record['fields']['number'] for record in records])
 
-    @mock.patch('random.randrange')
-    def test_create_no_random(self, mock_randrange: mock.MagicMock) -> None:
+    def test_iterate_fields(self) -> None:
+        """Test iterating over the IDs and fields of records."""
+
+        base = airtable.Airtable('base', '')
+        record_id = base.create('table', {'number': 3, 'other': 'a'})['id']
+        base.create('table', {'number': 4, 'other': 'b'})
+
+        pairs = airtablemock.Airtable('base', '').iterate_fields(
+            'table', filter_by_formula='number < 4', fields=('number',))
+
+        self.assertEqual([(record_id, {'number': 3})], list(pairs))
+
+    @mock.patch('random.getrandbits')
+    def test_create_no_random(self, mock_getrandbits: mock.MagicMock) -> None:
         """Tries creating an entry without randomness."""
 
-        mock_randrange.return_value = 14
+        mock_getrandbits.return_value = 14
 
         base = airtable.Airtable('base', '')
         base.create('table', {'number': 5})
         with self.assertRaises(RuntimeError):
             base.create('table', {'number': 6})
 
+    def test_create_copies_data(self) -> None:
+        """Modifying data after creating a record does not modify the record."""
+
+        base = airtable.Airtable('base', '')
+        data = {'number': 3}
+        base.create('table', data)
+        data['number'] = 4
+
+        records = base.iterate('table')
+        self.assertEqual([3], [record['fields']['number'] for record in records])
+
+    def test_records_are_read_only(self) -> None:
+        """Records fields cannot be modified without using the API."""
+
+        base = airtablemock.Airtable('base', '', read_only=True)
+        record = base.create('table', {'number': 3})
+
+        with self.assertRaises(TypeError):
+            typing.cast(typing.Dict[str, int], record['fields'])['number'] = 4
+
+        fetched_record = next(base.iterate('table'))
+        with self.assertRaises(TypeError):
+            typing.cast(typing.Dict[str, int], fetched_record['fields'])['number'] = 4
+
+        self.assertEqual(
+            {'number': 3}, base.get('table', typing.cast(str, record['id']))['fields'])
+
+    def test_records_are_copies(self) -> None:
+        """Modifying the fields of a record does not modify the table."""
+
+        base = airtable.Airtable('base', '')
+        record = base.create('table', {'number': 3})
+        record['fields']['number'] = 4
+
+        fetched_record = next(base.iterate('table'))
+        typing.cast(typing.Dict[str, int], fetched_record['fields'])['number'] = 5
+
+        self.assertEqual({'number': 3}, base.get('table', record['id'])['fields'])
+        self.assertEqual(
+            [{'number': 3}],
+            [record['fields'] for record in base.iterate('table', filter_by_formula='number = 3')])
+
     def test_update(self) -> None:
         """Updates a record partially."""
 
@@ -335,6 +626,28 @@ class AirtablemockTestCase(airtablemock.TestCase):
         self.assertEqual(
             [{'number': 4, 'untouched_field': 'original', 'new_field': 'future'}], fields)
 
+    def test_batch_update(self) -> None:
+        """Updates many records partially."""
+
+        base = airtablemock.Airtable('base', '')
+        record_id1 = typing.cast(
+            str, base.create('table', {'number': 3, 'untouched_field': 'original'})['id'])
+        base.create('table', {'number': 5})
+        record_id3 = typing.cast(str, base.create('table', {'number': 7})['id'])
+
+        records = base.batch_update(
+            'table', [(record_id1, {'number': 4}), (record_id3, {'new_field': 'future'})])
+        self.assertEqual([record_id1, record_id3], [record['id'] for record in records])
+
+        fields = [record['fields'] for record in base.iterate('table')]
+        self.assertEqual(
+            [
+                {'number': 4, 'untouched_field': 'original'},
+                {'number': 5},
+                {'number': 7, 'new_field': 'future'},
+            ],
+            fields)
+
     def test_update_all(self) -> None:
         """Updates a record entirely."""
 
@@ -346,6 +659,21 @@ class AirtablemockTestCase(airtablemock.TestCase):
         fields = [record['fields'] for record in base.iterate('table')]
         self.assertEqual([{'number': 4, 'new_field': 'future'}], fields)
 
+    def test_update_all_new_record(self) -> None:
+        """Updates entirely a record that did not exist yet."""
+
+        base = airtable.Airtable('base', '')
+        base.create('table', {'number': 3})
+        base.create('table', {'number': 4})
+        base.get('table')
+
+        base.update_all('table', 'recNEW', {'number': 5})
+
+        records = base.get('table')['records']
+        self.assertEqual([3, 4, 5], [record['fields']['number'] for record in records])
+        records = base.get('table', filter_by_formula='number = 5')['records']
+        self.assertEqual(['recNEW'], [record['id'] for record in records])
+
     def test_delete(self) -> None:
         """Delete a record."""
 